@@ -9,25 +9,27 @@ import json
 import socket
 import subprocess
 import datetime
-import svgwrite
-import pyautogui
-import serial  # for Arduino pulses
-from serial.tools import list_ports
+import collections
 
 import logging   # for detailed crash tracing
+import logging.handlers
+import atexit
 import shutil    # still here in case
 
 import ctypes
 from ctypes import wintypes
-from functools import partial
+from functools import lru_cache
+from xml.sax.saxutils import escape
 
-from PyQt6.QtCore    import Qt, QThread, pyqtSignal
+from PyQt6.QtCore    import (
+    Qt, QObject, QThread, QTimer, pyqtSignal, pyqtSlot, QAbstractTableModel, QModelIndex
+)
 from PyQt6.QtGui     import QPixmap, QGuiApplication, QFont, QFontMetrics
 from PyQt6.QtWidgets import (
     QApplication, QWidget, QLabel, QLineEdit, QPushButton,
     QComboBox, QVBoxLayout, QHBoxLayout, QMessageBox, QFrame,
     QPlainTextEdit, QStackedWidget, QCheckBox, QSizePolicy,
-    QListWidget, QTableWidget, QTableWidgetItem, QAbstractItemView,
+    QListWidget, QTableView, QStyledItemDelegate, QAbstractItemView,
     QGridLayout, QFileDialog, QButtonGroup
 )
 
@@ -41,17 +43,15 @@ COLOR_HEX = {
     "Stainless": "#00FF00",  # green
 }
 COLOR_NAMES = ["Silver", "Brass", "Plastic", "Stainless"]
+_COLOR_LUT  = {name.lower(): name for name in COLOR_NAMES}
 
+@lru_cache(maxsize=None)
 def normalize_color_name(s: str) -> str:
     """
     Normalize an incoming color name to one of the canonical keys in COLOR_HEX.
     Falls back to Silver (black) if unknown.
     """
-    s = (s or "").strip().lower()
-    for name in COLOR_NAMES:
-        if s == name.lower():
-            return name
-    return "Silver"
+    return _COLOR_LUT.get((s or "").strip().lower(), "Silver")
 
 # ─── BASE DIR & LOG FOLDER ────────────────────────────────────────────────────
 if getattr(sys, 'frozen', False):
@@ -63,12 +63,13 @@ os.makedirs(LOG_DIR, exist_ok=True)
 
 # ─── Logging configuration ────────────────────────────────────────────────────
 log_path = os.path.join(LOG_DIR, "app.log")
-logging.basicConfig(
-    filename=log_path,
-    filemode='w',
-    level=logging.DEBUG,
-    format='%(asctime)s %(levelname)-8s %(message)s'
-)
+# DEBUG records are buffered in 512-record batches; WARNING and above flush immediately
+_log_fh = logging.FileHandler(log_path, mode='w', encoding='utf8')
+_log_fh.setFormatter(logging.Formatter('%(asctime)s %(levelname)-8s %(message)s'))
+_log_mh = logging.handlers.MemoryHandler(512, flushLevel=logging.WARNING, target=_log_fh)
+logging.getLogger().addHandler(_log_mh)
+logging.getLogger().setLevel(logging.DEBUG)
+atexit.register(_log_mh.flush)
 def excepthook(exc_type, exc_value, exc_tb):
     logging.error("Uncaught exception", exc_info=(exc_type, exc_value, exc_tb))
 sys.excepthook = excepthook
@@ -142,17 +143,44 @@ def show_single_instance_warning_topmost():
     QMessageBox.warning(None, title, msg)
 
 # ─── AUTO-DISMISS “Save Project?” POPUP ────────────────────────────────────────
+SAVE_PROMPT_TITLE = "Save Project?"
+WM_KEYDOWN = 0x0100
+WM_KEYUP   = 0x0101
+VK_RETURN  = 0x0D
+VK_RIGHT   = 0x27
+
 auto_dismiss_event = threading.Event()
 def auto_dismiss_popups():
+    """
+    Poll for LightBurn's "Save Project?" prompt with a direct FindWindowW lookup
+    and answer it (Right → "No", Enter) by posting key messages to that window.
+    Polls every 0.5 s while idle and every 0.1 s right after a hit.
+    """
+    if os.name != "nt":
+        return
+
+    user32 = ctypes.WinDLL("user32")
+    FindWindowW = user32.FindWindowW
+    FindWindowW.argtypes = [wintypes.LPCWSTR, wintypes.LPCWSTR]
+    FindWindowW.restype  = wintypes.HWND
+    PostMessageW = user32.PostMessageW
+    PostMessageW.argtypes = [wintypes.HWND, wintypes.UINT, wintypes.WPARAM, wintypes.LPARAM]
+    PostMessageW.restype  = wintypes.BOOL
+
+    delay = 0.5
     while not auto_dismiss_event.is_set():
         try:
-            for dlg in pyautogui.getWindowsWithTitle("Save Project?"):
-                dlg.activate()
-                pyautogui.press("right")
-                pyautogui.press("enter")
+            hwnd = FindWindowW(None, SAVE_PROMPT_TITLE)
+            if hwnd:
+                for vk in (VK_RIGHT, VK_RETURN):
+                    PostMessageW(hwnd, WM_KEYDOWN, vk, 0)
+                    PostMessageW(hwnd, WM_KEYUP, vk, 0)
+                delay = 0.1
+            else:
+                delay = min(delay * 2, 0.5)
         except Exception:
             pass
-        time.sleep(0.2)
+        auto_dismiss_event.wait(delay)
 threading.Thread(target=auto_dismiss_popups, daemon=True).start()
 
 # ─── CONFIG ───────────────────────────────────────────────────────────────────
@@ -162,7 +190,11 @@ STENCILS_F   = os.path.join(exe_dir, ".laser_stencils.json")
 LOGO         = os.path.join(exe_dir, "453cf780-195e-4bdc-aba6-617024c9dd4d.png")
 LB_EXE       = r"C:\Program Files\LightBurn\LightBurn.exe"
 ARDUINO_BAUD = 115200
+FORCE_KILL_ON_TIMEOUT = True   # taskkill LightBurn if it ignores QUIT
+LASER_DEBUG  = os.environ.get("LASER_DEBUG", "0") == "1"  # verbose [DEBUG] lines in job logs
 os.makedirs(GENERATED, exist_ok=True)
+SVG_PATH_C00 = os.path.join(GENERATED, "laser_job_c00.svg")
+SVG_PATH_C01 = os.path.join(GENERATED, "laser_job_c01.svg")
 
 DEFAULT_PRESETS = {
     "Preset 1": {"x": 50.0, "y": 50.0, "font": 5.0, "offset": 26.0, "color": "Silver"},
@@ -170,10 +202,39 @@ DEFAULT_PRESETS = {
     "Preset 3": {"x": 50.0, "y": 54.0, "font": 7.0, "offset": 26.0, "color": "Plastic"},
 }
 
+# ─── JSON I/O ──────────────────────────────────────────────────────────────────
+# orjson is optional (faster); stdlib json is the fallback, with the same indent=2 layout
+try:
+    import orjson
+    def _dumps(obj):
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2)
+    _loads = orjson.loads
+except ImportError:
+    def _dumps(obj):
+        return json.dumps(obj, indent=2).encode("utf-8")
+    _loads = json.loads
+
+_json_cache = {}  # path -> (mtime_ns, size, parsed)
+
+def _cached_json(path):
+    """
+    Parse a JSON file, reusing the last parse while its mtime and size are unchanged.
+    Callers must not mutate the returned object.
+    """
+    st = os.stat(path)
+    key = (st.st_mtime_ns, st.st_size)
+    hit = _json_cache.get(path)
+    if hit and hit[:2] == key:
+        return hit[2]
+    with open(path, 'rb') as f:
+        data = _loads(f.read())
+    _json_cache[path] = (*key, data)
+    return data
+
 # ─── PRESETS I/O ───────────────────────────────────────────────────────────────
 def load_presets():
     try:
-        data = json.load(open(PRESETS_F))
+        data = _cached_json(PRESETS_F)
         out = {}
         for k, v in data.items():
             out[k] = {
@@ -191,90 +252,161 @@ def load_presets():
         return d
 
 def save_presets_file(presets_dict):
-    with open(PRESETS_F, 'w') as f:
-        json.dump(presets_dict, f, indent=2)
+    with open(PRESETS_F, 'wb') as f:
+        f.write(_dumps(presets_dict))
 
 # ─── STENCILS I/O ───────────────────────────────────────────────────────────────
 def load_stencils():
     try:
-        data = json.load(open(STENCILS_F))
+        data = _cached_json(STENCILS_F)
         if isinstance(data, dict):
-            return data
+            return dict(data)
         return {name: "Preset 1" for name in data}
     except:
         return {}
 
 def save_stencils(stencils_map):
-    with open(STENCILS_F, 'w') as f:
-        json.dump(stencils_map, f, indent=2)
+    with open(STENCILS_F, 'wb') as f:
+        f.write(_dumps(stencils_map))
 
 # ─── UDP HELPERS ───────────────────────────────────────────────────────────────
-sock_rcv = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
-sock_rcv.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
-sock_rcv.bind(("127.0.0.1", 19841))
+def open_rcv_socket():
+    s = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+    s.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+    s.setsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF, 256 * 1024)
+    s.bind(("127.0.0.1", 19841))
+    s.setblocking(False)
+    return s
+
+# Bound once for the whole session; on_start only drains it
+sock_rcv = open_rcv_socket()
+
+# One connected send socket for the whole session instead of socket()/close() per command
+_tx = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+_tx.connect(("127.0.0.1", 19840))
+
+# Reply buffer reused across calls; _cmd_lock serializes the worker and GUI threads
+_RX_BUF   = bytearray(1024)
+_cmd_lock = threading.Lock()
 
 def send_cmd(cmd, timeout=0.1):
-    s = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
-    try:
-        s.sendto(cmd.encode(), ("127.0.0.1", 19840))
-        sock_rcv.settimeout(timeout)
-        data, _ = sock_rcv.recvfrom(1024)
-        return data.decode().strip()
-    except socket.timeout:
-        return None
-    finally:
-        s.close()
+    """
+    Send a command to LightBurn and poll the (non-blocking) reply socket until
+    an answer arrives or `timeout` seconds pass. Returns None on timeout.
+    """
+    with _cmd_lock:
+        deadline = time.monotonic() + timeout
+        try:
+            _tx.send(cmd.encode())
+        except OSError:
+            # ICMP port-unreachable surfaces here while LightBurn isn't listening yet
+            return None
+        while True:
+            try:
+                n = sock_rcv.recv_into(_RX_BUF)
+                return _RX_BUF[:n].decode().strip()
+            except BlockingIOError:
+                if time.monotonic() > deadline:
+                    return None
+                time.sleep(0.001)
+            except OSError:
+                # ICMP port-unreachable can also surface on the receive side
+                return None
+
+def drain_replies():
+    """Discard any stale LightBurn replies still queued on sock_rcv."""
+    with _cmd_lock:
+        try:
+            while True:
+                sock_rcv.recv(4096)
+        except (BlockingIOError, ConnectionResetError):
+            pass
 
 def ensure_lightburn():
     subprocess.Popen([LB_EXE], stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
-    start = time.time()
-    while time.time() - start < 10:
+    # Retry fast at first (LightBurn is often already up), backing off to 200 ms between pings.
+    # The reply timeout stays at send_cmd's default: replies aren't matched to commands, so a
+    # short timeout would leave a late "OK" queued for the next command to read.
+    delay = 0.01
+    deadline = time.monotonic() + 10
+    while time.monotonic() < deadline:
         if send_cmd("PING") == "OK":
+            drain_replies()   # drop any late reply from an earlier PING
             return
-        time.sleep(0.2)
+        time.sleep(delay)
+        delay = min(delay * 1.5, 0.2)
     raise RuntimeError("LightBurn handshake failed")
 
+def taskkill_lightburn():
+    """Fire-and-forget force kill of LightBurn, without flashing a console window."""
+    subprocess.Popen(["taskkill","/IM","LightBurn.exe","/F"],
+                     stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+                     creationflags=getattr(subprocess, "CREATE_NO_WINDOW", 0), close_fds=True)
+
+def shutdown_lightburn(timeout=2.0):
+    """
+    Ask LightBurn to exit via QUIT and wait until it stops answering PING.
+    Falls back to taskkill after `timeout` seconds if FORCE_KILL_ON_TIMEOUT is set.
+    Returns True once LightBurn is gone (or has been killed), False if it may still be running.
+    """
+    send_cmd("QUIT")
+    deadline = time.monotonic() + timeout
+    misses = 0
+    while time.monotonic() < deadline:
+        # One dropped reply (e.g. LightBurn busy with a "Save Project?" prompt) isn't proof it exited
+        if send_cmd("PING") is None:
+            misses += 1
+            if misses >= 3:
+                return True
+        else:
+            misses = 0
+        time.sleep(0.05)
+    if FORCE_KILL_ON_TIMEOUT:
+        taskkill_lightburn()
+        return True
+    return False
+
 # ─── SVG GENERATION ────────────────────────────────────────────────────────────
+# Written by hand: the output is a handful of <text> elements, so a DOM library is overkill.
+_SVG_TMPL  = ('<?xml version="1.0" encoding="utf-8" ?>\n'
+              '<svg xmlns="http://www.w3.org/2000/svg" baseProfile="full" version="1.1" '
+              'width="{w}mm" height="{h}mm">{body}</svg>')
+_TEXT_TMPL = ('<text x="{x}mm" y="{y}mm" font-size="{fz}mm" text-anchor="middle" '
+              'fill="{c}" stroke="{c}" stroke-width="0"{tr}>{t}</text>')
+
+# Copy layouts as offset multipliers, keyed by copy count
+_POS_PATTERNS = {
+    1: ((0,0),),
+    2: ((0,0),(0,1)),
+    4: ((0,0),(1,0),(0,1),(1,1)),
+}
+
 def generate_svg_layers(t1, p1, t2, p2, t3, p3, copies):
     created = []
 
-    def draw_copies(dwg, txt, p, canvas_size, filename):
+    def draw_copies(body, txt, p):
         x0, y0, fz, off = p["x"], p["y"], p["font"], p["offset"]
         color_name = normalize_color_name(p.get("color", "Silver"))
+        # Color metadata for LightBurn layer mapping:
         hex_color  = COLOR_HEX[color_name]
+        t = escape(txt)
 
-        if copies == 1:
-            positions = [(0,0)]
-        elif copies == 2:
-            positions = [(0,0),(0,off)]
-        else:
-            positions = [(0,0),(off,0),(0,off),(off,off)]
-
-        for idx, (dx,dy) in enumerate(positions):
-            xi, yi = x0+dx, y0+dy
-            attrs = {
-                "insert": (f"{xi}mm", f"{yi}mm"),
-                "font_size": f"{fz}mm",
-                "text_anchor": "middle",
-
-                # Color metadata for LightBurn layer mapping:
-                "fill": hex_color,
-                "stroke": hex_color,
-                "stroke_width": 0,
-            }
-            if copies==2 and idx==1:
-                attrs["transform"] = f"rotate(180 {xi} {yi})"
-            dwg.add(dwg.text(txt, **attrs))
+        for idx, (mx,my) in enumerate(_POS_PATTERNS[copies]):
+            xi, yi = x0+mx*off, y0+my*off
+            tr = f' transform="rotate(180 {xi} {yi})"' if copies==2 and idx==1 else ""
+            body.append(_TEXT_TMPL.format(x=xi, y=yi, fz=fz, c=hex_color, tr=tr, t=t))
+
+    def write_svg(path, size, body):
+        with open(path, "w", encoding="utf-8") as f:
+            f.write(_SVG_TMPL.format(w=size, h=size, body="".join(body)))
 
     if t1:
-        path00 = os.path.join(GENERATED,"laser_job_c00.svg")
-        dwg1 = svgwrite.Drawing(path00,size=("100mm","100mm"))
-        draw_copies(dwg1,t1,p1,(100,100),path00)
-        dwg1.save(); created.append(path00)
+        body = []
+        draw_copies(body,t1,p1)
+        write_svg(SVG_PATH_C00,100,body); created.append(SVG_PATH_C00)
 
     if t2 or t3:
-        path01 = os.path.join(GENERATED,"laser_job_c01.svg")
-        dwg2 = svgwrite.Drawing(path01,size=("150mm","150mm"))
+        body = []
         entries=[]
         if t2: entries.append((t2,p2))
         if t3:
@@ -282,8 +414,8 @@ def generate_svg_layers(t1, p1, t2, p2, t3, p3, copies):
             p3m["y"]=(p2["y"]+4.0) if t2 else p3["y"]
             entries.append((t3,p3m))
         for txt,p in entries:
-            draw_copies(dwg2,txt,p,(150,150),path01)
-        dwg2.save(); created.append(path01)
+            draw_copies(body,txt,p)
+        write_svg(SVG_PATH_C01,150,body); created.append(SVG_PATH_C01)
 
     return created
 
@@ -296,44 +428,63 @@ class LoopThread(QThread):
         super().__init__(parent)
         self.layers      = layers
         self.running     = True
-        self.logf        = open(logfile,"w",encoding="utf8")
+        # Bound once: these are hit for every log line on the serial loop
+        self._now        = datetime.datetime.now
+        self._mono       = time.monotonic
+        self._basename   = os.path.basename
+        self.logf        = open(logfile,"w",encoding="utf8",buffering=65536)
+        self._last_flush = self._mono()
+        self._debug      = LASER_DEBUG
         self.current_idx = 0
         self.port        = com_port
+        self._rxbuf      = bytearray()
+        self.lightburn_stopped = False   # set by run() once LightBurn has been shut down
 
-        ports = [p.device for p in list_ports.comports()]
-        self.logmaj(f"[DEBUG] Available COM ports: {ports}")
+        import serial  # for Arduino pulses; imported lazily to keep startup light
+        from serial.tools import list_ports
+
+        if self._debug:
+            ports = [p.device for p in list_ports.comports()]
+            self.logmaj(f"[DEBUG] Available COM ports: {ports}")
 
         try:
             self.ser = serial.Serial(self.port, ARDUINO_BAUD, timeout=0.1)
             time.sleep(2)
-            self.logmaj(f"[DEBUG] Serial port opened on {self.port}")
+            if self._debug: self.logmaj(f"[DEBUG] Serial port opened on {self.port}")
         except Exception as e:
             self.logmaj(f"[WARNING] Could not open port {self.port}: {e}")
             self.ser = None
 
     def ts(self):
-        return datetime.datetime.now().isoformat()
+        return self._now().isoformat()
 
     def logmaj(self, msg, to_gui=False):
         line = f"{self.ts()} {msg}"
-        self.logf.write(line + "\n"); self.logf.flush()
+        self.logf.write(line + "\n")
+        # Flush at most every 200 ms, but right away for operator-visible events
+        now = self._mono()
+        if to_gui or now - self._last_flush > 0.2:
+            self.logf.flush(); self._last_flush = now
         if to_gui:
             self.log.emit(line)
 
     def _force_load_index(self, idx):
         path = self.layers[idx]
-        self.logmaj(f"→ FORCELOAD {os.path.basename(path)}")
+        self.logmaj(f"→ FORCELOAD {self._basename(path)}")
         send_cmd(f"FORCELOAD:{path}")
+        # LightBurn has no blocking "wait for load" command, so poll STATUS with a back-off
+        delay = 0.01
         st = send_cmd("STATUS")
         while st != "OK" and self.running:
-            time.sleep(0.05); st = send_cmd("STATUS")
+            time.sleep(delay); st = send_cmd("STATUS")
+            delay = min(delay * 2, 0.05)
         if not self.running: return False
         self.logmaj("✅ load confirmed", to_gui=True)
         time.sleep(0.2)
         return True
 
     def run(self):
-        self.logmaj("[DEBUG] LoopThread.run: Starting")
+        if self._debug: self.logmaj("[DEBUG] LoopThread.run: Starting")
         ensure_lightburn()
         time.sleep(0.5)
         if not self._force_load_index(self.current_idx): return
@@ -344,34 +495,222 @@ class LoopThread(QThread):
             if not self.ser:
                 time.sleep(0.1); continue
 
-            raw = self.ser.readline()
-            self.logmaj(f"[DEBUG] RAW SERIAL: {raw!r}")
-            try:
-                line = raw.decode("utf-8", errors="ignore").strip()
-                self.logmaj(f"[DEBUG] DECODED LINE: {line!r}")
-            except:
+            # Drain whatever is waiting in one read; read(1) blocks up to the port timeout when idle
+            n = self.ser.in_waiting
+            chunk = self.ser.read(n) if n else self.ser.read(1)
+            if not chunk:
                 continue
-            self.logmaj(f"[DEBUG] Arduino EVENT: {line!r}")
-
-            if "🔻 FALLING" in line:
-                self.logmaj("🔻 FALLING detected", to_gui=True)
-                self.current_idx = (self.current_idx + 1) % len(self.layers)
-                if not self._force_load_index(self.current_idx): break
-                self.ready.emit()
-
-            elif "⚡️ RISING" in line:
-                self.logmaj("⚡️ RISING detected", to_gui=True)
-                self.logmaj("→ START command sent", to_gui=True)
-                send_cmd("START"); time.sleep(1)
-
-        subprocess.Popen(["taskkill","/IM","LightBurn.exe","/F"],
-                         stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
-        self.logmaj("[DEBUG] LoopThread.run: Finished")
+            self._rxbuf += chunk
+            if b"\n" not in self._rxbuf:
+                continue
+
+            *raws, rest = self._rxbuf.split(b"\n")
+            self._rxbuf = bytearray(rest)
+            for raw in raws:
+                line = raw.decode("utf-8", errors="ignore").strip()
+                if self._debug: self.logmaj(f"[DEBUG] RAW SERIAL: {bytes(raw)!r} → EVENT: {line!r}")
+
+                if "🔻 FALLING" in line:
+                    self.logmaj("🔻 FALLING detected", to_gui=True)
+                    self.current_idx = (self.current_idx + 1) % len(self.layers)
+                    if not self._force_load_index(self.current_idx):
+                        self.running = False; break
+                    self.ready.emit()
+
+                elif "⚡️ RISING" in line:
+                    self.logmaj("⚡️ RISING detected", to_gui=True)
+                    self.logmaj("→ START command sent", to_gui=True)
+                    send_cmd("START"); time.sleep(1)
+
+        self.lightburn_stopped = shutdown_lightburn()
+        if self._debug: self.logmaj("[DEBUG] LoopThread.run: Finished")
         self.logf.close()
         if getattr(self, "ser", None):
             try:    self.ser.close()
             except: pass
 
+class RebootWorker(QObject):
+    """
+    Opens a COM port, sends REBOOT to the ESP32-C3 and closes it again.
+    Runs in its own QThread so the open/settle delay doesn't freeze the GUI.
+    """
+    finished = pyqtSignal(str)   # dev-log line on success
+    failed   = pyqtSignal(str)   # error message
+
+    def __init__(self, port, parent=None):
+        super().__init__(parent)
+        self.port = port
+
+    @pyqtSlot()
+    def run(self):
+        try:
+            import serial
+            tmp = serial.Serial(self.port, ARDUINO_BAUD, timeout=1)
+            time.sleep(0.1)
+            tmp.write(b"REBOOT\n")
+            tmp.flush()
+            tmp.close()
+            self.finished.emit(f"{datetime.datetime.now().isoformat()} ↻ Sent REBOOT to ESP32-C3 on {self.port}")
+        except Exception as e:
+            self.failed.emit(f"Failed to open {self.port} to send REBOOT:\n{e}")
+
+# ─── PRESET TABLE MODEL ────────────────────────────────────────────────────────
+PRESET_COLUMNS = ("name", "color", "x", "y", "font", "offset")
+
+class PresetTableModel(QAbstractTableModel):
+    """
+    Table model over the GUI's presets dict. The view only asks for visible cells,
+    and edits land in setData() so a change touches a single index.
+    """
+    HEADERS = ["Preset","Color","X","Y","Font","Offset"]
+    # Name column is read-only; every other column is editable
+    FLAGS_RO = Qt.ItemFlag.ItemIsSelectable | Qt.ItemFlag.ItemIsEnabled
+    FLAGS_RW = FLAGS_RO | Qt.ItemFlag.ItemIsEditable
+
+    presetEdited = pyqtSignal(str)   # name of the preset whose values changed
+    invalidValue = pyqtSignal(str)   # rejected (non-numeric) cell text
+
+    def __init__(self, presets, parent=None):
+        super().__init__(parent)
+        self.presets = presets
+        self.names   = list(presets)
+        self._rows   = {n: i for i, n in enumerate(self.names)}   # name -> row
+        self._strs   = {}   # name -> ("%.1f" x, y, font, offset), rebuilt only when that preset changes
+
+    def sync(self, presets):
+        """
+        Bring the rows in line with `presets` without a reset: drop vanished names,
+        append new ones and mark the surviving rows as changed.
+        """
+        self.presets = presets
+        self._strs.clear()
+        for name in [n for n in self.names if n not in presets]:
+            self.remove_preset(name)
+        for name in presets:
+            if name not in self._rows:
+                self.insert_preset(name)
+        if self.names:
+            self.dataChanged.emit(self.index(0, 0), self.index(len(self.names)-1, len(PRESET_COLUMNS)-1))
+
+    def name_at(self, row):
+        return self.names[row]
+
+    def row_of(self, name):
+        return self._rows.get(name)
+
+    def insert_preset(self, name):
+        row = len(self.names)
+        self.beginInsertRows(QModelIndex(), row, row)
+        self.names.append(name)
+        self._rows[name] = row
+        self.endInsertRows()
+
+    def remove_preset(self, name):
+        row = self._rows[name]
+        self.beginRemoveRows(QModelIndex(), row, row)
+        del self.names[row]
+        del self._rows[name]
+        self._strs.pop(name, None)
+        for n in self.names[row:]:
+            self._rows[n] -= 1
+        self.endRemoveRows()
+
+    def preset_changed(self, name):
+        self._strs.pop(name, None)
+        row = self._rows[name]
+        self.dataChanged.emit(self.index(row, 0), self.index(row, len(PRESET_COLUMNS)-1))
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.names)
+
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(PRESET_COLUMNS)
+
+    def headerData(self, section, orientation, role=Qt.ItemDataRole.DisplayRole):
+        if orientation == Qt.Orientation.Horizontal and role == Qt.ItemDataRole.DisplayRole:
+            return self.HEADERS[section]
+        return None
+
+    def flags(self, index):
+        if not index.isValid():
+            return Qt.ItemFlag.NoItemFlags
+        return self.FLAGS_RO if index.column() == 0 else self.FLAGS_RW
+
+    def data(self, index, role=Qt.ItemDataRole.DisplayRole):
+        if not index.isValid() or role not in (Qt.ItemDataRole.DisplayRole, Qt.ItemDataRole.EditRole):
+            return None
+        name = self.names[index.row()]
+        col  = index.column()
+        if col == 0:
+            return name
+        v = self.presets[name]
+        if col == 1:
+            return normalize_color_name(v.get("color","Silver"))
+        strs = self._strs.get(name)
+        if strs is None:
+            strs = self._strs[name] = ("%.1f" % v["x"], "%.1f" % v["y"], "%.1f" % v["font"], "%.1f" % v["offset"])
+        return strs[col-2]
+
+    def setData(self, index, value, role=Qt.ItemDataRole.EditRole):
+        if not index.isValid() or role != Qt.ItemDataRole.EditRole or index.column() == 0:
+            return False
+        name  = self.names[index.row()]
+        param = PRESET_COLUMNS[index.column()]
+        if param == "color":
+            new = normalize_color_name(value)
+        else:
+            try:
+                new = float(value)
+            except (TypeError, ValueError):
+                self.invalidValue.emit(str(value))
+                return False
+        if self.presets[name].get(param) == new:
+            return True
+        self.presets[name][param] = new
+        self._strs.pop(name, None)
+        self.dataChanged.emit(index, index, [Qt.ItemDataRole.DisplayRole, Qt.ItemDataRole.EditRole])
+        self.presetEdited.emit(name)
+        return True
+
+class LazyColorComboBox(QComboBox):
+    """
+    Color picker that holds only its current color until the popup is first opened,
+    then fills in the full COLOR_NAMES list.
+    """
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._populated = False
+
+    def set_color(self, name):
+        if self._populated:
+            self.setCurrentText(name)
+        else:
+            self.clear(); self.addItem(name)
+
+    def showPopup(self):
+        if not self._populated:
+            cur = self.currentText()
+            self.blockSignals(True)
+            self.clear(); self.addItems(COLOR_NAMES); self.setCurrentText(cur)
+            self.blockSignals(False)
+            self._populated = True
+        super().showPopup()
+
+class PresetColorDelegate(QStyledItemDelegate):
+    """
+    Color column editor: a LazyColorComboBox, only created while a cell is being edited.
+    """
+    def createEditor(self, parent, option, index):
+        cb = LazyColorComboBox(parent)
+        cb.activated.connect(lambda _i, cb=cb: self.commitData.emit(cb))
+        return cb
+
+    def setEditorData(self, editor, index):
+        editor.set_color(index.data(Qt.ItemDataRole.EditRole))
+
+    def setModelData(self, editor, model, index):
+        model.setData(index, editor.currentText(), Qt.ItemDataRole.EditRole)
+
 # ─── MAIN GUI ─────────────────────────────────────────────────────────────────
 class LaserGUI(QWidget):
     def __init__(self):
@@ -379,12 +718,15 @@ class LaserGUI(QWidget):
         self.presets      = load_presets()
         self.stencils_map = load_stencils()
         self.stencils     = list(self.stencils_map.keys())
+        self._preset_display = {}   # preset name -> formatted combo label
+        self._mono_font = QFont("Courier New")
+        self._mono_font.setStyleHint(QFont.StyleHint.Monospace)
         self.current_layers = []
         self.worker       = None
+        self._lightburn_launched = False
+        self._reboot_thread = self._reboot_worker = None   # standalone REBOOT in flight
         self.selected_port = None
 
-        self._preset_table_populating = False  # prevents feedback loops
-
         self.text1 = QLineEdit(); self.text2 = QLineEdit(); self.text3 = QLineEdit()
         default_pt = self.text1.font().pointSize()
         big_font = QFont(); big_font.setPointSize(default_pt * 2)
@@ -405,6 +747,8 @@ class LaserGUI(QWidget):
         self.line2_color = "Silver"  # default → black
         self.line2_color_group = QButtonGroup(self)
         self.line2_color_group.setExclusive(True)
+        # One slot for the whole group; the button id is the index into COLOR_NAMES
+        self.line2_color_group.idToggled.connect(self.on_line2_color_toggled)
 
         self.line2_color_checks = {}
         # Tiny labels so you can actually tell which is which without guessing like it's a loot box
@@ -415,12 +759,11 @@ class LaserGUI(QWidget):
             "Plastic":   "Plastic → Red",
             "Stainless": "Stainless → Green"
         }
-        for name in COLOR_NAMES:
+        for i, name in enumerate(COLOR_NAMES):
             cb = QCheckBox(short[name])
             cb.setToolTip(tip[name])
             cb.setStyleSheet("background-color: transparent; color: white;")  # readable on dark bg
-            cb.toggled.connect(partial(self.on_line2_color_toggled, name))
-            self.line2_color_group.addButton(cb)
+            self.line2_color_group.addButton(cb, i)
             self.line2_color_checks[name] = cb
 
         # Default selection: Silver (black)
@@ -431,9 +774,8 @@ class LaserGUI(QWidget):
         self.close_btn = QPushButton("Close Program")
         for btn in (self.start_btn, self.stop_btn):
             h = btn.sizeHint(); btn.setFixedSize(h.width()*5, h.height()*5)
-        self.start_btn.setStyleSheet("background-color: green; color: black;")
-        self.stop_btn .setStyleSheet("background-color: red;   color: black;")
-        self.close_btn.setStyleSheet("background-color: white; color: black;")
+        self.start_btn.setObjectName("ctrlStart")
+        self.stop_btn .setObjectName("ctrlStop")
 
         self.layer_label = QLabel("Layer: –")
         Lf = self.layer_label.font(); Lf.setPointSize(18); Lf.setBold(True)
@@ -444,19 +786,45 @@ class LaserGUI(QWidget):
         self.preset_cbs    = [self.preset1, self.preset2, self.preset3]
         self.extra_widgets = []
 
+        # Worker log lines are queued and painted at most once per 50 ms tick (~20 repaints/s)
+        self._log_queue = collections.deque()
+        self._log_timer = QTimer(self)
+        self._log_timer.timeout.connect(self._flush_log)
+        self._log_timer.start(50)
+
+        # Preset/stencil edits are written to disk 250 ms after the last change
+        self._save_timer = QTimer(self)
+        self._save_timer.setSingleShot(True)
+        self._save_timer.setInterval(250)
+        self._save_timer.timeout.connect(lambda: save_presets_file(self.presets))
+        self._stencils_save_timer = QTimer(self)
+        self._stencils_save_timer.setSingleShot(True)
+        self._stencils_save_timer.setInterval(250)
+        self._stencils_save_timer.timeout.connect(lambda: save_stencils(self.stencils_map))
+
         self.initUI()
 
-    def on_line2_color_toggled(self, name, checked: bool):
+    def on_line2_color_toggled(self, button_id: int, checked: bool):
         if checked:
-            self.line2_color = normalize_color_name(name)
+            self.line2_color = normalize_color_name(COLOR_NAMES[button_id])
             logging.debug(f"Line 2 color override set to: {self.line2_color}")
 
+    def _on_worker_log(self, line):
+        self._log_queue.append(line)
+
+    def _flush_log(self):
+        if not self._log_queue:
+            return
+        lines = []
+        while self._log_queue:
+            lines.append(self._log_queue.popleft())
+        text = "\n".join(lines)
+        self.log.appendPlainText(text)
+        self.dev_log.appendPlainText(text)
+
     def _get_line2_color_override(self) -> str:
-        # Always return a valid canonical name
-        for name, cb in self.line2_color_checks.items():
-            if cb.isChecked():
-                return normalize_color_name(name)
-        return "Silver"
+        # Kept canonical by on_line2_color_toggled; defaults to "Silver" before the first toggle
+        return self.line2_color
 
     def initUI(self):
         self.setWindowTitle("Raycus Laser UI v1.166-dev")
@@ -517,6 +885,10 @@ class LaserGUI(QWidget):
 
         self.log = QPlainTextEdit(readOnly=True, placeholderText="Job status…")
         self.log.setFixedHeight(100); self.log.setMinimumWidth(600)
+        # Rolling buffer: oldest lines drop off so appends don't slow down over a long shift
+        self.log.setMaximumBlockCount(2000)
+        self.log.setUndoRedoEnabled(False)
+        self.log.setCenterOnScroll(False)
         vl_left.addWidget(self.log)
 
         hl_main.addLayout(vl_left, 1)
@@ -564,16 +936,22 @@ class LaserGUI(QWidget):
         content.addWidget(QLabel("<h2>Preset Management</h2>"), alignment=Qt.AlignmentFlag.AlignCenter)
         pm_row = QHBoxLayout(); self.new_preset_input = QLineEdit(placeholderText="New preset name")
         self.add_preset_btn = QPushButton("Add Preset"); self.add_preset_btn.clicked.connect(self.add_preset)
-        pm_row.addWidget(self.new_preset_input); pm_row.addWidget(self.add_preset_btn)
+        self.reload_presets_btn = QPushButton("Reload Presets"); self.reload_presets_btn.clicked.connect(self.reload_presets_from_disk)
+        pm_row.addWidget(self.new_preset_input); pm_row.addWidget(self.add_preset_btn); pm_row.addWidget(self.reload_presets_btn)
         content.addLayout(pm_row)
 
-        self.preset_table = QTableWidget(0,6)
-        self.preset_table.setHorizontalHeaderLabels(["Preset","Color","X","Y","Font","Offset"])
+        # Queued so saving/refreshing runs after the view has finished committing the edit
+        self.preset_model = PresetTableModel(self.presets, self)
+        self.preset_model.presetEdited.connect(self.on_preset_edited, Qt.ConnectionType.QueuedConnection)
+        self.preset_model.invalidValue.connect(self.on_preset_value_rejected, Qt.ConnectionType.QueuedConnection)
+        self.preset_table = QTableView()
+        self.preset_table.setModel(self.preset_model)
+        self.preset_color_delegate = PresetColorDelegate(self.preset_table)
+        self.preset_table.setItemDelegateForColumn(1, self.preset_color_delegate)
         self.preset_table.verticalHeader().setVisible(False)
         self.preset_table.setSelectionBehavior(QAbstractItemView.SelectionBehavior.SelectRows)
         self.preset_table.setEditTriggers(QAbstractItemView.EditTrigger.AllEditTriggers)
-        self.preset_table.cellChanged.connect(self.on_preset_cell_changed)
-        self.preset_table.itemSelectionChanged.connect(self.on_preset_table_selected)
+        self.preset_table.selectionModel().selectionChanged.connect(lambda *_: self.on_preset_table_selected())
         content.addWidget(self.preset_table)
 
         self.remove_preset_btn = QPushButton("Remove Selected Preset"); self.remove_preset_btn.clicked.connect(self.remove_preset)
@@ -599,6 +977,8 @@ class LaserGUI(QWidget):
         content.addWidget(next_btn, alignment=Qt.AlignmentFlag.AlignCenter)
         self.dev_log = QPlainTextEdit(readOnly=True, placeholderText="Job status…")
         self.dev_log.setMinimumWidth(600)
+        self.dev_log.setMaximumBlockCount(5000)
+        self.dev_log.setUndoRedoEnabled(False)
         self.dev_log.setSizePolicy(QSizePolicy.Policy.Expanding, QSizePolicy.Policy.Expanding)
         content.addWidget(self.dev_log, 1)
 
@@ -633,9 +1013,12 @@ class LaserGUI(QWidget):
         content.addStretch(); dv.addLayout(content); self.stack.addWidget(dev)
 
         layout = QVBoxLayout(self); layout.addWidget(self.stack); self.stack.setCurrentIndex(0)
-        for btn in self.findChildren(QPushButton):
-            if btn not in (self.start_btn, self.stop_btn):
-                btn.setStyleSheet("background-color: white; color: black;")
+        # One window-level sheet instead of a per-button setStyleSheet walk
+        self.setStyleSheet(
+            "QPushButton { background-color: white; color: black; }"
+            "QPushButton#ctrlStart { background-color: green; }"
+            "QPushButton#ctrlStop  { background-color: red; }"
+        )
 
         self.start_btn.clicked.connect(self.on_start)
         self.stop_btn.clicked.connect(self.on_stop)
@@ -663,7 +1046,7 @@ class LaserGUI(QWidget):
         path, _ = QFileDialog.getOpenFileName(self, "Select JSON Config", "", "JSON Files (*.json)")
         if not path: return
         try:
-            cfg = json.load(open(path))
+            cfg = _cached_json(path)
         except Exception as e:
             QMessageBox.critical(self, "Error", f"Failed to load config: {e}")
             return
@@ -709,6 +1092,7 @@ class LaserGUI(QWidget):
             self.extra_widgets[idx].setVisible(visible)
 
     def refresh_ports(self):
+        from serial.tools import list_ports
         ports = [p.device for p in list_ports.comports()]
         self.port_combo.clear()
         self.port_combo.addItems(ports or ["<no ports>"])
@@ -733,19 +1117,32 @@ class LaserGUI(QWidget):
             QMessageBox.warning(self, "Error", "No COM port selected")
             return
 
-        try:
-            tmp = serial.Serial(self.selected_port, ARDUINO_BAUD, timeout=1)
-            time.sleep(0.1)
-            tmp.write(b"REBOOT\n")
-            tmp.flush()
-            tmp.close()
-            msg = f"{datetime.datetime.now().isoformat()} ↻ Sent REBOOT to ESP32-C3 on {self.selected_port}"
-            self.dev_log.appendPlainText(msg)
-        except Exception as e:
-            QMessageBox.critical(self, "Error", f"Failed to open {self.selected_port} to send REBOOT:\n{e}")
+        thread = QThread(self)
+        worker = RebootWorker(self.selected_port)
+        worker.moveToThread(thread)
+        thread.started.connect(worker.run)
+        worker.finished.connect(self.dev_log.appendPlainText)
+        worker.failed.connect(self._on_reboot_failed)
+        worker.finished.connect(thread.quit)
+        worker.failed.connect(thread.quit)
+        thread.finished.connect(worker.deleteLater)
+        thread.finished.connect(thread.deleteLater)
+        thread.finished.connect(self._on_reboot_done)
+
+        # Keep references until the thread finishes
+        self._reboot_thread, self._reboot_worker = thread, worker
+        self.reboot_btn.setEnabled(False)
+        thread.start()
+
+    def _on_reboot_failed(self, msg):
+        QMessageBox.critical(self, "Error", msg)
+
+    def _on_reboot_done(self):
+        self._reboot_thread = self._reboot_worker = None
+        self.reboot_btn.setEnabled(True)
 
     def refresh_stencils(self):
-        self.stencils_map = load_stencils()
+        # stencils_map is loaded once in __init__; saves are deferred, so disk may lag behind it
         self.stencils = list(self.stencils_map.keys())
         self.stencil_combo.clear()
         self.stencil_combo.addItem("-- none --")
@@ -761,104 +1158,149 @@ class LaserGUI(QWidget):
         if not nm or nm in self.stencils_map:
             QMessageBox.warning(self,"Error",f"Stencil '{nm}' invalid or exists"); return
         self.stencils_map[nm] = self.new_stencil_preset.currentText()
-        save_stencils(self.stencils_map); self.new_stencil_input.clear(); self.refresh_stencils()
+        self._stencils_save_timer.start(); self.new_stencil_input.clear()
+        self.stencils.append(nm)
+        self.stencil_combo.addItem(nm)
+        self.stencil_list.addItem(nm)
 
     def remove_stencil(self):
         items = self.stencil_list.selectedItems()
         if items:
             nm = items[0].text()
             self.stencils_map.pop(nm,None)
-            save_stencils(self.stencils_map); self.refresh_stencils()
+            self._stencils_save_timer.start()
+            if nm in self.stencils: self.stencils.remove(nm)
+            idx = self.stencil_combo.findText(nm)
+            if idx != -1:
+                # Fall back to "-- none --" (clears Line 2) rather than letting a neighbour become current
+                if idx == self.stencil_combo.currentIndex():
+                    self.stencil_combo.setCurrentIndex(0)
+                self.stencil_combo.removeItem(idx)
+            self.stencil_list.takeItem(self.stencil_list.row(items[0]))
 
     def update_stencil_mapping(self):
         nm = self.stencil_list.currentItem().text() if self.stencil_list.currentItem() else None
         if not nm: return
         self.stencils_map[nm] = self.edit_stencil_preset.currentText()
-        save_stencils(self.stencils_map); self.refresh_stencils()
+        self._stencils_save_timer.start()   # names are unchanged, so the lists need no update
 
     # ─── Presets UI refresh (includes color) ───────────────────────────────
     def refresh_presets(self):
-        sel = [cb.currentData() for cb in (self.preset1, self.preset2, self.preset3)]
-        table_sel_name = self.selected_preset_label.text()
+        """Rebuild the three line combos and the table from the in-memory presets."""
+        self._rebuild_preset_combos()
+        self._rebuild_preset_table()
 
+    def reload_presets_from_disk(self):
+        """Explicitly re-read the presets file (e.g. after editing it by hand) and rebuild the UI."""
+        self._flush_pending_saves()
         self.presets = load_presets()
-        mono = QFont("Courier New")
+        self._preset_display.clear()
+        self.refresh_presets()
 
-        for cb in (self.preset1,self.preset2,self.preset3):
+    def _preset_display_text(self, name):
+        # Combo labels are cached per preset; _format_preset_display refreshes one entry
+        display = self._preset_display.get(name)
+        if display is None:
+            display = self._format_preset_display(name)
+        return display
+
+    def _format_preset_display(self, name):
+        v = self.presets[name]
+        c = normalize_color_name(v.get("color","Silver"))
+        self._preset_display[name] = f"{name:<12}  C:{c:<9}  X:{v['x']:>5.1f}  Y:{v['y']:>5.1f}  F:{v['font']:>4.1f}  O:{v['offset']:>4.1f}"
+        return self._preset_display[name]
+
+    def _rebuild_preset_combos(self):
+        sel = [cb.currentData() for cb in self.preset_cbs]
+
+        names    = list(self.presets)
+        displays = [self._preset_display_text(n) for n in names]
+        for cb in self.preset_cbs:
             cb.blockSignals(True)
             cb.clear()
-            cb.setFont(mono)
-            for name,v in self.presets.items():
-                c = normalize_color_name(v.get("color","Silver"))
-                display = f"{name:<12}  C:{c:<9}  X:{v['x']:>5.1f}  Y:{v['y']:>5.1f}  F:{v['font']:>4.1f}  O:{v['offset']:>4.1f}"
-                cb.addItem(display,name)
+            cb.setFont(self._mono_font)
+            cb.addItems(displays)   # one batched model insert
+            for i, nm in enumerate(names):
+                cb.setItemData(i, nm)
             cb.blockSignals(False)
 
-        for cb, wanted in zip((self.preset1,self.preset2,self.preset3), sel):
+        for cb, wanted in zip(self.preset_cbs, sel):
             if wanted:
                 idx = cb.findData(wanted)
                 if idx != -1:
                     cb.setCurrentIndex(idx)
 
-        self._preset_table_populating = True
-        self.preset_table.blockSignals(True)
-        self.preset_table.setRowCount(0)
-
-        for i,(name,v) in enumerate(self.presets.items()):
-            self.preset_table.insertRow(i)
-
-            item = QTableWidgetItem(name)
-            item.setFlags(item.flags() & ~Qt.ItemFlag.ItemIsEditable)
-            self.preset_table.setItem(i,0,item)
-
-            cbox = QComboBox()
-            cbox.addItems(COLOR_NAMES)
-            cval = normalize_color_name(v.get("color","Silver"))
-            cbox.setCurrentText(cval)
-            cbox.currentTextChanged.connect(partial(self.on_preset_color_changed, i))
-            self.preset_table.setCellWidget(i, 1, cbox)
-
-            self.preset_table.setItem(i,2,QTableWidgetItem(f"{v['x']:.1f}"))
-            self.preset_table.setItem(i,3,QTableWidgetItem(f"{v['y']:.1f}"))
-            self.preset_table.setItem(i,4,QTableWidgetItem(f"{v['font']:.1f}"))
-            self.preset_table.setItem(i,5,QTableWidgetItem(f"{v['offset']:.1f}"))
-
-        self.preset_table.blockSignals(False)
-        self._preset_table_populating = False
-
-        if table_sel_name and table_sel_name in self.presets:
-            for r in range(self.preset_table.rowCount()):
-                if self.preset_table.item(r,0) and self.preset_table.item(r,0).text() == table_sel_name:
-                    self.preset_table.selectRow(r)
-                    self.on_preset_table_selected()
-                    break
-
-    def on_preset_color_changed(self, row, color_text):
-        if self._preset_table_populating:
-            return
+    def _rebuild_preset_table(self):
+        table_sel_name = self.selected_preset_label.text()
+
+        # No sorting or painting while the model syncs; one viewport update afterwards
+        self.preset_table.setUpdatesEnabled(False)
+        prev_sort = self.preset_table.isSortingEnabled()
+        self.preset_table.setSortingEnabled(False)
+        self.preset_model.sync(self.presets)
+        self.preset_table.setSortingEnabled(prev_sort)
+        self.preset_table.setUpdatesEnabled(True)
+        self.preset_table.viewport().update()
+
+        row = self.preset_model.row_of(table_sel_name)
+        if row is not None:
+            self.preset_table.selectRow(row)
+            self.on_preset_table_selected()
+        elif table_sel_name:
+            self._clear_preset_selection()   # selected preset vanished on reload
+
+    def _clear_preset_selection(self):
+        self.selected_preset_label.setText("")
+        for fld in self.preset_edit_fields.values():
+            fld.clear()
+
+    # In-place updates for a single preset; the rest of the UI is left alone
+    def _preset_combos_update(self, name):
+        display = self._format_preset_display(name)
+        for cb in self.preset_cbs:
+            idx = cb.findData(name)
+            if idx != -1:
+                cb.blockSignals(True); cb.setItemText(idx, display); cb.blockSignals(False)
+
+    def _preset_combos_add(self, name):
+        display = self._format_preset_display(name)
+        for cb in self.preset_cbs:
+            cb.blockSignals(True); cb.addItem(display, name); cb.blockSignals(False)
+
+    def _preset_combos_remove(self, name):
+        self._preset_display.pop(name, None)
+        for cb in self.preset_cbs:
+            idx = cb.findData(name)
+            if idx != -1:
+                cb.blockSignals(True); cb.removeItem(idx); cb.blockSignals(False)
+
+    def on_preset_edited(self, name):
+        # A table cell (color or numeric) was committed through PresetTableModel.setData;
+        # the table already shows the new value, so only the combos and side fields follow.
         try:
-            name_item = self.preset_table.item(row, 0)
-            if not name_item:
-                return
-            name = name_item.text()
-            c = normalize_color_name(color_text)
-            self.presets[name]["color"] = c
-            save_presets_file(self.presets)
-            self.refresh_presets()
+            self._save_timer.start()
+            self._preset_combos_update(name)
+            if self.selected_preset_label.text() == name:
+                self.on_preset_table_selected()
         except Exception as e:
-            logging.error(f"Failed to change preset color: {e}", exc_info=True)
+            logging.error(f"Failed to apply edited preset {name!r}: {e}", exc_info=True)
+
+    def on_preset_value_rejected(self, text):
+        QMessageBox.warning(self,"Error",f"'{text}' not numeric")
 
     def add_preset(self):
         name = self.new_preset_input.text().strip()
         if not name or name in self.presets:
             QMessageBox.warning(self,"Error",f"Preset '{name}' invalid or exists"); return
         self.presets[name] = {"x":50.0,"y":50.0,"font":5.0,"offset":26.0,"color":"Silver"}
-        save_presets_file(self.presets); self.new_preset_input.clear(); self.refresh_presets()
+        self._save_timer.start(); self.new_preset_input.clear()
+        self.preset_model.insert_preset(name)
+        self._preset_combos_add(name)
 
     def on_preset_table_selected(self):
-        items = self.preset_table.selectedItems()
-        if not items: return
-        name = items[0].text()
+        rows = self.preset_table.selectionModel().selectedRows()
+        if not rows: return
+        name = self.preset_model.name_at(rows[0].row())
         self.selected_preset_label.setText(name)
         vals = self.presets[name]
         self.preset_color_edit.setCurrentText(normalize_color_name(vals.get("color","Silver")))
@@ -866,53 +1308,40 @@ class LaserGUI(QWidget):
             fld.setText(str(vals[p]))
 
     def remove_preset(self):
-        items = self.preset_table.selectedItems()
-        if not items: return
-        name = self.preset_table.item(items[0].row(), 0).text()
+        rows = self.preset_table.selectionModel().selectedRows()
+        if not rows: return
+        name = self.preset_model.name_at(rows[0].row())
+        self.preset_model.remove_preset(name)
         self.presets.pop(name,None)
-        save_presets_file(self.presets); self.refresh_presets()
+        self._save_timer.start()
+        self._preset_combos_remove(name)
+        if self.selected_preset_label.text() == name:
+            self._clear_preset_selection()
 
     def update_preset(self):
         name = self.selected_preset_label.text()
-        if not name: return
-        try:
-            vals = {p: float(self.preset_edit_fields[p].text()) for p in self.preset_edit_fields}
-        except ValueError:
-            QMessageBox.warning(self,"Error","All numeric fields must be numeric"); return
+        if not name or name not in self.presets: return
+        vals = {}
+        for p, fld in self.preset_edit_fields.items():
+            try:
+                vals[p] = float(fld.text())
+            except ValueError:
+                # Put back just the offending field's stored value and point the user at it
+                bad = fld.text()
+                fld.setText(str(self.presets[name][p])); fld.setFocus(); fld.selectAll()
+                QMessageBox.warning(self,"Error",f"{p}: '{bad}' not numeric"); return
 
         vals["color"] = normalize_color_name(self.preset_color_edit.currentText())
         self.presets[name] = vals
-        save_presets_file(self.presets)
+        self._save_timer.start()
+        self.preset_model.preset_changed(name)
+        self._preset_combos_update(name)
         QMessageBox.information(self,"Success",f"Preset '{name}' updated")
-        self.refresh_presets()
-
-    def on_preset_cell_changed(self, row, col):
-        if self._preset_table_populating:
-            return
-        if col not in {2,3,4,5}:
-            return
-        param = ("x","y","font","offset")[col-2]
-        name = self.preset_table.item(row,0).text()
-        text = self.preset_table.item(row,col).text()
-        try:
-            v = float(text)
-        except ValueError:
-            QMessageBox.warning(self,"Error",f"'{text}' not numeric"); self.refresh_presets(); return
-        self.presets[name][param] = v
-        save_presets_file(self.presets)
-        self.preset_table.selectRow(row)
-        self.on_preset_table_selected()
-        self.refresh_presets()
 
     def on_start(self):
         logging.debug("╸ ENTER on_start()")
         try:
-            global sock_rcv
-            try: sock_rcv.close()
-            except: pass
-            sock_rcv = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
-            sock_rcv.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
-            sock_rcv.bind(("127.0.0.1",19841))
+            drain_replies()
 
             logging.debug("╸ Validating inputs…")
             t1,t2,t3 = self.text1.text().strip(),self.text2.text().strip(),self.text3.text().strip()
@@ -960,10 +1389,12 @@ class LaserGUI(QWidget):
             logfile = os.path.join(LOG_DIR,f"laser_job_{ts}.txt")
             logging.debug(f"╸ Launching LoopThread with {logfile}")
             self.worker = LoopThread(layers, logfile, self.selected_port)
-            self.worker.log.connect(self.log.appendPlainText)
-            self.worker.log.connect(self.dev_log.appendPlainText)
+            self.worker.log.connect(self._on_worker_log)
             self.worker.ready.connect(self.update_layer_label)
+            # The worker asks LightBurn to QUIT (up to ~2 s) on its own thread; finish up when it's done
+            self.worker.finished.connect(self._on_worker_stopped)
 
+            self._lightburn_launched = True   # LoopThread.run() launches LightBurn
             self.worker.start()
             self.start_btn.setEnabled(False)
             self.stop_btn.setEnabled(True)
@@ -978,17 +1409,38 @@ class LaserGUI(QWidget):
         self.worker.current_idx = (self.worker.current_idx+1)%len(self.current_layers)
         self.worker._force_load_index(self.worker.current_idx)
         self.update_layer_label()
+        self._flush_log()
         self.log.appendPlainText("🖱 Next Layer")
 
     def on_stop(self):
-        auto_dismiss_event.set()
+        self.stop_btn.setEnabled(False)
         if self.worker:
             self.worker.running = False
-            self.worker.wait()
-            if getattr(self.worker, "ser", None):
-                try:    self.worker.ser.close()
+            # Drop the GUI connections first so no queued log/ready events outlive the worker
+            for sig in (self.worker.log, self.worker.ready):
+                try:    sig.disconnect()
+                except TypeError: pass
+            return   # _on_worker_stopped runs off the finished signal wired up in on_start
+        self._finish_stop()
+
+    def _on_worker_stopped(self):
+        self._release_worker()
+        self._finish_stop()
+
+    def _release_worker(self):
+        worker, self.worker = self.worker, None
+        if worker:
+            if getattr(worker, "ser", None):
+                try:    worker.ser.close()
                 except: pass
+            if worker.lightburn_stopped:
+                self._lightburn_launched = False   # already shut down; no second taskkill
+
+    def _finish_stop(self):
+        # Popup watcher stays up until LightBurn is gone so a QUIT-triggered "Save Project?" gets answered
+        auto_dismiss_event.set()
         self.kill_lightburn()
+        self._flush_log()
         self.log.appendPlainText("⏹ Stopped by user")
         self.start_btn.setEnabled(True)
         self.stop_btn.setEnabled(False)
@@ -1020,14 +1472,41 @@ class LaserGUI(QWidget):
         else:       self.enter_borderless_fullscreen()
 
     def kill_lightburn(self):
+        # Nothing to kill unless a job (which launches LightBurn) was started this session
+        if not self._lightburn_launched:
+            return
+        self._lightburn_launched = False
         try:
-            subprocess.Popen(["taskkill","/IM","LightBurn.exe","/F"],
-                             stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+            taskkill_lightburn()
         except Exception as e:
             logging.error(f"Failed to kill LightBurn: {e}")
 
+    def _flush_pending_saves(self):
+        if self._save_timer.isActive():
+            self._save_timer.stop(); save_presets_file(self.presets)
+        if self._stencils_save_timer.isActive():
+            self._stencils_save_timer.stop(); save_stencils(self.stencils_map)
+
     def closeEvent(self, event):
-        self.kill_lightburn(); event.accept()
+        # A running QThread must not be destroyed with the window; let the REBOOT finish first
+        if self._reboot_thread is not None:
+            try:
+                self._reboot_thread.quit()
+                self._reboot_thread.wait()
+            except RuntimeError:
+                pass   # already finished and deleted via deleteLater
+        # Same for a LoopThread still shutting LightBurn down (e.g. Close right after Stop)
+        if self.worker is not None:
+            self.worker.running = False
+            try:    self.worker.finished.disconnect(self._on_worker_stopped)
+            except TypeError: pass
+            self.worker.wait()
+            self._release_worker()
+        self._flush_pending_saves()
+        self.kill_lightburn()
+        try:    sock_rcv.close()
+        except: pass
+        event.accept()
 
 if __name__ == "__main__":
     logging.debug("╸ Application starting")